@@ -7,13 +7,17 @@ from langchain_astradb import AstraDBVectorStore
 from product_assistant.utils.model_loader import ModelLoader
 from product_assistant.utils.config_loader import load_config
 
+# Above this many texts, embeddings go through the (cheaper, slower) Gemini Batch API
+# when embedding_model.use_batch_api is enabled
+BATCH_API_THRESHOLD = 500
+
 class DataIngestion:
     """
     class to handle the data transformation and ingestion into AstraDB.
     """
 
     def __init__(self):
-        pass
+        self.model_loader = None
 
     def _load_env_variables(self):
         pass
@@ -27,9 +31,16 @@ class DataIngestion:
     def transform_data(self):
         pass
 
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        if self.model_loader is None:
+            self.model_loader = ModelLoader()
+        if len(texts) > BATCH_API_THRESHOLD and self.model_loader.batch_embeddings_enabled():
+            return self.model_loader.embed_batch_async(texts)
+        return self.model_loader.embed_batch(texts)
+
     def store_in_vector_db(self):
         pass
 
     def run_pipeline(self):
-        pass
+        raise NotImplementedError("DataIngestion.run_pipeline is not implemented yet")
     
\ No newline at end of file
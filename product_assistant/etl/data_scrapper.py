@@ -1,26 +1,126 @@
-from bs4 import BeautifulSoup
-import selenium 
 import csv
 import time
 import re
 import os
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.action_chains import ActionChains 
+from urllib.parse import quote_plus
+
+from product_assistant.logger.custom_logger import CustomLogger
+from product_assistant.utils.batch_writer import BatchWriter
+from product_assistant.utils.browser_pool import BROWSER_POOL, PlaywrightNotInstalledError
+
+log = CustomLogger().get_logger(__name__)
 
 class FlipkartScapper:
-    def __init__(self, output_dir="data"):
+    BASE_URL = "https://www.flipkart.com"
+    # column order of the rows returned by scrape_flipkart_products
+    CSV_HEADER = ["product_id", "product_title", "rating", "total_reviews", "price", "top_reviews"]
+
+    # Listing / product page selectors (Flipkart obfuscates class names; update here when they change)
+    CARD_CSS = "div[data-id]"
+    TITLE_CSS = "div.KzDlHZ"
+    PRICE_CSS = "div.Nx9bqj"
+    RATING_CSS = "div.XQDdHH"
+    REVIEW_COUNT_CSS = "span.Wphh3N"
+    LINK_CSS = "a[href*='/p/']"
+    REVIEW_CSS = "div._27M-vq, div.col.EPCmJX, div._6K-7Co"
+    POPUP_CLOSE_CSS = "button:has-text('✕')"
+
+    def __init__(self, output_dir="data", browser_pool=None):
         self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
+        # anything with run_page(fn, stealth=...) works; defaults to the shared Chromium
+        self.browser_pool = browser_pool or BROWSER_POOL
+
+    def _close_popup(self, page):
+        # count() does not wait, so pages without the login popup cost nothing here
+        popup = page.locator(self.POPUP_CLOSE_CSS)
+        try:
+            if popup.count():
+                popup.first.click(timeout=2000)
+        except Exception:
+            pass
+
+    def _text(self, root, selector):
+        el = root.query_selector(selector)
+        return el.inner_text().strip() if el else "N/A"
 
     def get_top_reviews(self, product_url, counts = 5):
-        pass
-    
+        def read_reviews(page):
+            page.goto(product_url, wait_until="domcontentloaded")
+            self._close_popup(page)
+            try:
+                page.wait_for_selector(self.REVIEW_CSS, timeout=10000)
+            except Exception:
+                return []
+
+            reviews, seen = [], set()
+            for block in page.query_selector_all(self.REVIEW_CSS):
+                text = " ".join(block.inner_text().split())
+                if text and text not in seen:
+                    seen.add(text)
+                    reviews.append(text)
+                if len(reviews) >= counts:
+                    break
+            return reviews
+
+        try:
+            reviews = self.browser_pool.run_page(read_reviews, stealth=True)
+        except PlaywrightNotInstalledError:
+            raise
+        except Exception as e:
+            # one slow/broken product page must not cost the whole query its rows
+            log.warning(f"Failed to read reviews from {product_url}: {e}")
+            reviews = []
+        return " || ".join(reviews) if reviews else "No reviews found"
+
     def scrape_flipkart_products(self, query, max_products = 4, review_counts = 4):
-        pass
+        def read_listing(page):
+            page.goto(f"{self.BASE_URL}/search?q={quote_plus(query)}", wait_until="domcontentloaded")
+            self._close_popup(page)
+            try:
+                page.wait_for_selector(self.CARD_CSS, timeout=15000)
+            except Exception:
+                return []
 
-    def save_to_csv(self, data, filename = "scraped_data.csv"):
-        pass
+            rows = []
+            for item in page.query_selector_all(self.CARD_CSS)[:max_products]:
+                link_el = item.query_selector(self.LINK_CSS)
+                href = link_el.get_attribute("href") if link_el else None
+                if not href:
+                    continue
+                product_link = href if href.startswith("http") else self.BASE_URL + href
+                match = re.search(r"/p/(itm[0-9A-Za-z]+)", href)
+
+                reviews_text = self._text(item, self.REVIEW_COUNT_CSS)
+                count_match = re.search(r"\d+(,\d+)*(?=\s+Reviews)", reviews_text)
+
+                rows.append([
+                    match.group(1) if match else "N/A",
+                    self._text(item, self.TITLE_CSS),
+                    self._text(item, self.RATING_CSS),
+                    count_match.group(0) if count_match else "N/A",
+                    self._text(item, self.PRICE_CSS),
+                    product_link,
+                ])
+            return rows
 
-    
\ No newline at end of file
+        try:
+            products = self.browser_pool.run_page(read_listing, stealth=True)
+        except PlaywrightNotInstalledError:
+            raise
+        except Exception as e:
+            log.error(f"Failed to scrape listing for {query!r}: {e}")
+            return []
+
+        # product pages are opened as separate jobs after the listing page is released
+        for row in products:
+            row[5] = self.get_top_reviews(row[5], counts=review_counts)
+            time.sleep(1)  # be gentle with the host between product pages
+        return products
+
+    def save_to_csv(self, data, filename = "scraped_data.csv"):
+        path = os.path.join(self.output_dir, filename)
+        with BatchWriter(path, header=self.CSV_HEADER) as writer:
+            writer.add_many(data)
+        log.info(f"Saved {len(data)} rows to {path}")
+        return path
@@ -0,0 +1,56 @@
+import csv
+import time
+from pathlib import Path
+
+
+class BatchWriter:
+    """
+    Buffers CSV rows and writes them in batches: a batch is flushed once it
+    holds `max_rows` rows or `max_wait_ms` has passed since the last flush
+    (checked on each add), plus once more on exit. The file is truncated on
+    enter and the header is written a single time.
+    """
+
+    def __init__(self, path, header=None, max_rows=100, max_wait_ms=500):
+        self.path = Path(path)
+        self.header = header
+        self.max_rows = max_rows
+        self.max_wait = max_wait_ms / 1000.0
+        self._rows = []
+        self._file = None
+        self._writer = None
+        self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        if self.header:
+            self._writer.writerow(self.header)
+        return self
+
+    def add(self, row):
+        self._rows.append(row)
+        self._maybe_flush()
+
+    def add_many(self, rows):
+        self._rows.extend(rows or [])
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self._rows) >= self.max_rows or time.monotonic() - self._last_flush >= self.max_wait:
+            self.flush()
+
+    def flush(self):
+        if self._rows:
+            self._writer.writerows(self._rows)
+            self._rows = []
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+        return False
@@ -0,0 +1,158 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Number of browser-owning worker threads (one Chromium each)
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "4"))
+
+log = logging.getLogger(__name__)
+
+
+class PlaywrightNotInstalledError(RuntimeError):
+    pass
+
+
+class _BrowserSlot:
+    """
+    One Playwright driver + Chromium, created and used only on its worker thread.
+    """
+
+    def __init__(self):
+        self._pw = None
+        self._browser = None
+
+    def browser(self):
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+        self.shutdown()  # stop a disconnected browser's driver before relaunching
+        try:
+            from playwright.sync_api import sync_playwright
+        except Exception:
+            raise PlaywrightNotInstalledError(
+                "Playwright is not installed. Install it via:\n"
+                "  python -m pip install playwright\n"
+                "  python -m playwright install chromium"
+            )
+        pw = sync_playwright().start()
+        try:
+            browser = pw.chromium.launch(headless=True, args=["--no-sandbox"])
+        except Exception:
+            pw.stop()
+            raise
+        self._pw, self._browser = pw, browser
+        return browser
+
+    def shutdown(self):
+        browser, pw = self._browser, self._pw
+        self._browser = self._pw = None
+        if browser is not None:
+            try:
+                browser.close()
+            except Exception as e:
+                log.warning(f"Failed to close Chromium: {e}")
+        if pw is not None:
+            try:
+                pw.stop()
+            except Exception as e:
+                log.warning(f"Failed to stop Playwright: {e}")
+
+
+class BrowserPool:
+    """
+    Warm Chromium instances shared by every Playwright-based scraper.
+    Playwright's sync API is bound to the thread that started it, so each
+    browser lives on its own long-lived daemon worker thread. Callers submit
+    page jobs with run_page(); up to `size` jobs run at once, one per browser,
+    and each job gets a fresh context + page.
+    """
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE):
+        self.size = max(1, size)
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self._threads = []
+        self._closed = False
+
+    # --- runs on a worker thread ----------------------------------------
+    def _worker(self):
+        slot = _BrowserSlot()
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    break
+                fn, future = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(fn(slot))
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            slot.shutdown()
+
+    def _run_page(self, slot, fn, user_agent, stealth):
+        context = slot.browser().new_context(user_agent=user_agent)
+        try:
+            page = context.new_page()
+            page.set_default_timeout(60000)  # 60s
+            if stealth:
+                _apply_stealth(page)
+            return fn(page)
+        finally:
+            context.close()
+
+    # --- public API, safe to call from any thread -----------------------
+    def run_page(self, fn, user_agent: str = USER_AGENT, stealth: bool = False):
+        """
+        Run fn(page) on one of the browser threads and return its result.
+        fn must not keep the page around after it returns.
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BrowserPool is closed")
+            if not self._threads:
+                # browsers themselves are launched lazily, on each worker's first job
+                for i in range(self.size):
+                    t = threading.Thread(target=self._worker, name=f"browser-pool-{i}", daemon=True)
+                    t.start()
+                    self._threads.append(t)
+            self._jobs.put((lambda slot: self._run_page(slot, fn, user_agent, stealth), future))
+        return future.result()
+
+    def close(self, timeout: float = 30):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = list(self._threads)
+            for _ in threads:
+                self._jobs.put(None)  # each worker closes its own browser on the way out
+        for t in threads:
+            t.join(timeout)
+            if t.is_alive():
+                log.warning(f"{t.name} did not shut down within {timeout}s")
+
+
+def _apply_stealth(page):
+    # playwright-stealth is optional; without it pages are used as-is
+    try:
+        from playwright_stealth import stealth_sync
+    except Exception:
+        return
+    stealth_sync(page)
+
+
+BROWSER_POOL = BrowserPool()
+# worker threads are daemons, so they are still alive (and able to close Chromium) when atexit runs
+atexit.register(BROWSER_POOL.close)
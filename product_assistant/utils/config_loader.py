@@ -1,10 +1,16 @@
+from functools import lru_cache
 from pathlib import Path
 import yaml
 
+# libyaml's C parser when PyYAML was built with it, pure-Python otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+@lru_cache(maxsize=1)
 def load_config():
     """
     Loads the YAML configuration file from product_assistant/config/config.yaml
     regardless of current working directory.
+    The result is cached per process; treat the returned dict as read-only.
     """
     # This file lives in product_assistant/utils/config_loader.py
     # We want: product_assistant/config/config.yaml
@@ -15,4 +21,4 @@ def load_config():
         raise FileNotFoundError(f"Config file not found: {config_path}")
 
     with open(config_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
@@ -1,6 +1,9 @@
 import os
 import sys
-import asyncio
+import json
+import time
+import tempfile
+from typing import List
 from dotenv import load_dotenv
 
 # --- Internal imports (corrected paths) ---
@@ -9,9 +12,8 @@ from product_assistant.utils.config_loader import load_config
 from product_assistant.exception.custom_exception import ProductAssistantException
 
 # --- External dependencies ---
-from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
-from langchain_openai import ChatOpenAI
-from langchain_groq import ChatGroq
+# langchain_* providers are imported inside the loaders: they pull in large
+# dependency trees and would otherwise slow down every importer of this module.
 
 # -----------------------------------------------------------------------------
 # SETUP
@@ -19,6 +21,22 @@ from langchain_groq import ChatGroq
 load_dotenv()
 log = CustomLogger().get_logger(__name__)
 
+# Embedding models accepted by the Gemini Batch API (batches.create_embeddings)
+BATCH_EMBEDDING_MODELS = {"gemini-embedding-001"}
+
+# One token-bucket limiter per model, shared by every LLM instance in the process
+_RATE_LIMITERS = {}
+
+def _get_rate_limiter(model_name: str, requests_per_minute: float):
+    if model_name not in _RATE_LIMITERS:
+        from langchain_core.rate_limiters import InMemoryRateLimiter
+        _RATE_LIMITERS[model_name] = InMemoryRateLimiter(
+            requests_per_second=requests_per_minute / 60.0,
+            check_every_n_seconds=0.1,
+            max_bucket_size=max(1, int(requests_per_minute // 60)),
+        )
+    return _RATE_LIMITERS[model_name]
+
 # -----------------------------------------------------------------------------
 # API KEY MANAGER
 # -----------------------------------------------------------------------------
@@ -43,8 +61,11 @@ class ApiKeyManager:
 # -----------------------------------------------------------------------------
 # MODEL LOADER
 # -----------------------------------------------------------------------------
+# Always use ModelLoader.embed_batch for more than one document: it sends
+# chunks of texts per request instead of one HTTP round-trip per text.
 class ModelLoader:
     def __init__(self):
+        self._embeddings = None
         try:
             self.api_mgr = ApiKeyManager()
             self.config = load_config()
@@ -64,6 +85,7 @@ class ModelLoader:
 
             log.info(f"Loading Embedding Model: {model_name}")
 
+            import asyncio
             try:
                 asyncio.get_running_loop()
             except RuntimeError:
@@ -73,18 +95,145 @@ class ModelLoader:
             if not google_key:
                 raise ProductAssistantException("GOOGLE_API_KEY not found", sys)
 
+            from langchain_google_genai import GoogleGenerativeAIEmbeddings
             return GoogleGenerativeAIEmbeddings(model=model_name, google_api_key=google_key)
 
         except Exception as e:
             log.error(f"Failed to load embeddings: {e}")
             raise ProductAssistantException("Failed to load embedding model", e)
 
+    # ------------------------------
+    def embed_batch(self, texts: List[str], batch_size: int = 100) -> List[List[float]]:
+        """
+        Embed many texts with one embed_documents call per chunk of `batch_size`.
+        The embeddings client is created once and reused across chunks/calls.
+        """
+        if batch_size < 1:
+            raise ProductAssistantException("batch_size must be >= 1", sys)
+        try:
+            if self._embeddings is None:
+                self._embeddings = self.load_embeddings()
+
+            vectors: List[List[float]] = []
+            for start in range(0, len(texts), batch_size):
+                chunk = texts[start:start + batch_size]
+                vectors.extend(self._embeddings.embed_documents(chunk))
+
+            log.info(f"Embedded {len(vectors)} texts in batches of {batch_size}")
+            return vectors
+
+        except Exception as e:
+            log.error(f"Failed to embed batch: {e}")
+            raise ProductAssistantException("Failed to embed documents", e)
+
+    # ------------------------------
+    def batch_embeddings_enabled(self) -> bool:
+        """
+        True when embedding_model.use_batch_api is set and model_name is a Batch API model.
+        Both paths embed with model_name, so stored vectors never depend on the batch size.
+        """
+        emb_conf = self.config.get("embedding_model", {})
+        model_name = (emb_conf.get("model_name") or "").removeprefix("models/")
+        return bool(emb_conf.get("use_batch_api")) and model_name in BATCH_EMBEDDING_MODELS
+
+    # ------------------------------
+    def embed_batch_async(
+        self,
+        texts: List[str],
+        display_name: str = "product-assistant-embeddings",
+        poll_interval: int = 30,
+        timeout: int = 6 * 60 * 60,
+    ) -> List[List[float]]:
+        """
+        Embed texts through the Gemini Batch API (asynchronous, billed at batch rates).
+        Blocks while polling the job for at most `timeout` seconds, then cancels it.
+        Meant for large background ingestion runs where latency does not matter.
+        Returns vectors in the order of `texts`.
+        """
+        try:
+            from google import genai
+            from google.genai import types
+
+            model_name = self.config.get("embedding_model", {}).get("model_name")
+            if not model_name:
+                raise ProductAssistantException("Missing embedding_model.model_name", sys)
+            if model_name.removeprefix("models/") not in BATCH_EMBEDDING_MODELS:
+                raise ProductAssistantException(
+                    f"{model_name} is not supported by the Gemini Batch API "
+                    f"(supported: {', '.join(sorted(BATCH_EMBEDDING_MODELS))})", sys
+                )
+
+            google_key = self.api_mgr.get("GOOGLE_API_KEY")
+            if not google_key:
+                raise ProductAssistantException("GOOGLE_API_KEY not found", sys)
+
+            client = genai.Client(api_key=google_key)
+
+            with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False, encoding="utf-8") as f:
+                for i, text in enumerate(texts):
+                    # same task type LangChain's embed_documents uses on the sync path
+                    req = {
+                        "key": str(i),
+                        "request": {"content": {"parts": [{"text": text}]}, "taskType": "RETRIEVAL_DOCUMENT"},
+                    }
+                    f.write(json.dumps(req) + "\n")
+                src_path = f.name
+            try:
+                uploaded = client.files.upload(
+                    file=src_path,
+                    config=types.UploadFileConfig(display_name=display_name, mime_type="jsonl"),
+                )
+            finally:
+                os.remove(src_path)
+
+            job = client.batches.create_embeddings(
+                model=model_name,
+                src=types.EmbeddingsBatchJobSource(file_name=uploaded.name),
+                config={"display_name": display_name},
+            )
+            log.info(f"Submitted embedding batch job {job.name} for {len(texts)} texts")
+
+            done_states = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+            deadline = time.monotonic() + timeout
+            while job.state.name not in done_states:
+                if time.monotonic() >= deadline:
+                    client.batches.cancel(name=job.name)
+                    raise ProductAssistantException(
+                        f"Embedding batch job {job.name} still {job.state.name} after {timeout}s; cancelled", sys
+                    )
+                time.sleep(min(poll_interval, max(0, deadline - time.monotonic())))
+                job = client.batches.get(name=job.name)
+
+            if job.state.name != "JOB_STATE_SUCCEEDED":
+                raise ProductAssistantException(f"Embedding batch job {job.name} ended in {job.state.name}", sys)
+
+            raw = client.files.download(file=job.dest.file_name).decode("utf-8")
+            vectors: List[List[float]] = [None] * len(texts)
+            for line in raw.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                vectors[int(item["key"])] = item["response"]["embedding"]["values"]
+
+            if any(v is None for v in vectors):
+                raise ProductAssistantException(f"Embedding batch job {job.name} returned incomplete results", sys)
+
+            log.info(f"Embedding batch job {job.name} returned {len(vectors)} vectors")
+            return vectors
+
+        except Exception as e:
+            log.error(f"Failed to run embedding batch job: {e}")
+            raise ProductAssistantException("Failed to embed documents via batch API", e)
+
     # ------------------------------
     def load_llm(self):
         try:
             llm_cfg = self.config.get("llm", {}).get("openai", {})
             model_name = llm_cfg.get("model_name", "gpt-4o-mini")
             temperature = llm_cfg.get("temperature", 0.2)
+            max_retries = llm_cfg.get("max_retries", 5)
+            request_timeout = llm_cfg.get("request_timeout", 30)
+            rpm = llm_cfg.get("requests_per_minute")
 
             log.info(f"Loading LLM model: {model_name}")
 
@@ -92,7 +241,16 @@ class ModelLoader:
             if not openai_key:
                 raise ProductAssistantException("OPENAI_API_KEY not found", sys)
 
-            return ChatOpenAI(model=model_name, api_key=openai_key, temperature=temperature)
+            from langchain_openai import ChatOpenAI
+            # ChatOpenAI retries 429/5xx itself with exponential backoff
+            return ChatOpenAI(
+                model=model_name,
+                api_key=openai_key,
+                temperature=temperature,
+                max_retries=max_retries,
+                timeout=request_timeout,
+                rate_limiter=_get_rate_limiter(model_name, rpm) if rpm else None,
+            )
 
         except Exception as e:
             log.error(f"Failed to load LLM: {e}")
@@ -113,6 +271,9 @@ if __name__ == "__main__":
         vec = embeddings.embed_query("Hello world!")
         print("✅ Embedding vector length:", len(vec))
 
+        vecs = loader.embed_batch(["Hello world!", "Goodbye world!"])
+        print("✅ Batch embeddings:", len(vecs))
+
         # Test LLM
         llm = loader.load_llm()
         print("✅ LLM loaded:", llm)
@@ -1,7 +1,11 @@
 # scraper2.py
 # Run:  python scraper2.py
 # Deps (install into your venv):
-#   python -m pip install requests beautifulsoup4 pandas gradio
+#   python -m pip install requests beautifulsoup4 lxml pandas gradio
+# Optional HTTP/2 client for static pages (falls back to requests):
+#   python -m pip install "httpx[http2]"
+# Optional on-disk HTTP cache for repeat fetches (requests / httpx paths):
+#   python -m pip install requests-cache "hishel<1.0"
 # Optional for JS-rendered pages:
 #   python -m pip install playwright
 #   python -m playwright install chromium
@@ -11,28 +15,44 @@ import os
 import re
 import csv
 import time
+import asyncio
+import shutil
 import tempfile
-from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse, urljoin
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+import soupsieve
 import pandas as pd
 
 import gradio as gr
 
+from product_assistant.utils.browser_pool import BROWSER_POOL, USER_AGENT, PlaywrightNotInstalledError
+
+try:
+    import httpx
+except Exception:
+    httpx = None
+
+try:
+    import requests_cache
+except Exception:
+    requests_cache = None
+
+try:
+    import hishel
+except Exception:
+    hishel = None
+
 # ---------- IMPORTANT COMPLIANCE GUARD ----------
 # This app is for sites that PERMIT scraping.
 # Myntra's Terms forbid automated scraping/crawling.
 BLOCKED_HOSTS = {"myntra.com", "www.myntra.com"}
 
-USER_AGENT = (
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/120.0.0.0 Safari/537.36"
-)
 HEADERS = {
     "User-Agent": USER_AGENT,
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
@@ -40,27 +60,141 @@ HEADERS = {
     "Referer": "https://www.google.com/",
 }
 
+_PRICE_RE = re.compile(r"(\d[\d,]*\.?\d*)")
+
+# Static fetches are cached on disk when the cache libraries are installed.
+# Policy (both requests-cache and hishel): the site's Cache-Control/Expires win;
+# responses that give no freshness lifetime are served from cache for CACHE_TTL.
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "scrape_cache")
+CACHE_TTL = 3600
+
+CSV_FIELDS = ["product_name", "price_text", "price_value", "image_url", "review", "product_url"]
+
+# Retry policy shared by the requests adapter and the httpx paths
+RETRY_TOTAL = 5
+RETRY_BACKOFF = 1.2  # 0, 1.2, 2.4, 4.8, ...
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
 def make_session() -> requests.Session:
-    s = requests.Session()
+    if requests_cache is not None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        s = requests_cache.CachedSession(
+            os.path.join(CACHE_DIR, "requests"),
+            backend="sqlite",
+            expire_after=CACHE_TTL,
+            cache_control=True,
+            allowable_methods=("GET",),
+        )
+    else:
+        s = requests.Session()
     retries = Retry(
-        total=5,
-        backoff_factor=1.2,  # 0, 1.2, 2.4, 4.8, ...
-        status_forcelist=[429, 500, 502, 503, 504],
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=list(RETRY_STATUSES),
         allowed_methods=["GET", "HEAD"],
         raise_on_status=False,
     )
-    s.mount("https://", HTTPAdapter(max_retries=retries))
-    s.mount("http://", HTTPAdapter(max_retries=retries))
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=retries)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers.update(HEADERS)
     return s
 
+# Shared across fetches so same-host requests reuse keep-alive connections
+_SESSION = make_session()
+
+def _httpx_transport(transport_cls):
+    # http2/limits/retries live on the transport; the client ignores them once one is given
+    return transport_cls(
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+    )
+
+def _httpx_kwargs(transport) -> dict:
+    return dict(
+        transport=transport,
+        headers=HEADERS,
+        follow_redirects=True,
+        timeout=httpx.Timeout(10.0, read=60.0),
+    )
+
+# HTTP/2 client for static fetches; requires `httpx[http2]`, else requests is used
+_HTTPX = None
+_HTTPX_CACHED = None  # same connection pool behind a hishel cache layer
+if httpx is not None:
+    try:
+        _transport = _httpx_transport(httpx.HTTPTransport)
+        _HTTPX = httpx.Client(**_httpx_kwargs(_transport))
+    except Exception:
+        _HTTPX = None
+    if _HTTPX is not None and hishel is not None:
+
+        class _FallbackTTLTransport(httpx.BaseTransport):
+            # hishel's Controller only caches responses with explicit freshness; give the
+            # rest max-age=CACHE_TTL, matching requests-cache's expire_after fallback
+            _DIRECTIVES = ("max-age", "s-maxage", "no-store", "no-cache")
+
+            def __init__(self, transport):
+                self._transport = transport
+
+            def handle_request(self, request):
+                resp = self._transport.handle_request(request)
+                cc = resp.headers.get("Cache-Control", "")
+                if "Expires" not in resp.headers and not any(d in cc.lower() for d in self._DIRECTIVES):
+                    resp.headers["Cache-Control"] = f"{cc}, max-age={CACHE_TTL}" if cc else f"max-age={CACHE_TTL}"
+                return resp
+
+            def close(self):
+                self._transport.close()
+
+        try:
+            _HTTPX_CACHED = httpx.Client(**_httpx_kwargs(hishel.CacheTransport(
+                transport=_FallbackTTLTransport(_transport),
+                storage=hishel.FileStorage(base_path=Path(CACHE_DIR) / "httpx", ttl=CACHE_TTL),
+            )))
+        except Exception:
+            _HTTPX_CACHED = None
+HTTPX_AVAILABLE = _HTTPX is not None
+
+def _retry_delay(attempt: int, resp) -> float:
+    retry_after = resp.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return min(float(retry_after), 60.0)
+    return 0.0 if attempt == 0 else RETRY_BACKOFF * (2 ** (attempt - 1))
+
+def _httpx_get(client, url: str, timeout):
+    # httpx transport retries only cover connect errors; retry 429/5xx like urllib3's Retry
+    for attempt in range(RETRY_TOTAL + 1):
+        resp = client.get(url, timeout=timeout)
+        if resp.status_code not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+            return resp
+        time.sleep(_retry_delay(attempt, resp))
+
+async def _httpx_get_async(client, url: str, timeout):
+    for attempt in range(RETRY_TOTAL + 1):
+        resp = await client.get(url, timeout=timeout)
+        if resp.status_code not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+            return resp
+        await asyncio.sleep(_retry_delay(attempt, resp))
+
+BLOCKED_RESOURCE_TYPES = {"image", "stylesheet", "font", "media"}
+
+def _block_heavy_resources(route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
 def domain_blocked(url: str) -> bool:
     host = urlparse(url).hostname or ""
     host = host.lower()
     return host.endswith("myntra.com")
 
-def fetch_html(url: str, use_js: bool, network_timeout_read: int = 45) -> str:
+def fetch_html(url: str, use_js: bool, network_timeout_read: int = 45, use_cache: bool = True) -> str:
     """
     Fetch page HTML. If use_js=True, try Playwright for JS-rendered pages.
+    Static fetches go through the on-disk HTTP cache unless use_cache=False.
     """
     if domain_blocked(url):
         raise ValueError(
@@ -70,54 +204,94 @@ def fetch_html(url: str, use_js: bool, network_timeout_read: int = 45) -> str:
         )
 
     if use_js:
+        def render(page):
+            # only the DOM is parsed, so skip downloading assets
+            page.route("**/*", _block_heavy_resources)
+            page.goto(url, wait_until="domcontentloaded")
+            return page.content()
+
         try:
-            from playwright.sync_api import sync_playwright
-        except Exception:
-            raise RuntimeError(
-                "Playwright is not installed. Install it via:\n"
-                "  python -m pip install playwright\n"
-                "  python -m playwright install chromium\n"
-                "Or uncheck 'Render JavaScript' and try again."
-            )
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True, args=["--no-sandbox"])
-            context = browser.new_context(user_agent=USER_AGENT)
-            page = context.new_page()
-            page.set_default_timeout(60000)  # 60s
-            page.goto(url, wait_until="networkidle")
-            html = page.content()
-            browser.close()
-            return html
+            return BROWSER_POOL.run_page(render, user_agent=USER_AGENT)
+        except PlaywrightNotInstalledError as e:
+            raise RuntimeError(f"{e}\nOr uncheck 'Render JavaScript' and try again.")
+    elif HTTPX_AVAILABLE:
+        client = _HTTPX_CACHED if use_cache and _HTTPX_CACHED is not None else _HTTPX
+        resp = _httpx_get(client, url, httpx.Timeout(10.0, read=network_timeout_read))
+        resp.raise_for_status()
+        return resp.text
     else:
-        s = make_session()
-        resp = s.get(url, headers=HEADERS, timeout=(10, network_timeout_read))
+        kwargs = {}
+        if not use_cache and requests_cache is not None:
+            # per-request bypass; cache_disabled() would flip it for every concurrent caller
+            kwargs["force_refresh"] = True
+        resp = _SESSION.get(url, timeout=(10, network_timeout_read), **kwargs)
         resp.raise_for_status()
         return resp.text
 
+async def fetch_many(urls: List[str], network_timeout_read: int = 45) -> List[str]:
+    """
+    Fetch several static pages concurrently over one HTTP/2 client.
+    Returns HTML in the same order as `urls`.
+    """
+    if not HTTPX_AVAILABLE:
+        raise RuntimeError(
+            "fetch_many needs httpx with HTTP/2 support. Install it via:\n"
+            "  python -m pip install \"httpx[http2]\""
+        )
+    blocked = [u for u in urls if domain_blocked(u)]
+    if blocked:
+        raise ValueError(f"Blocked host(s) in batch: {', '.join(blocked)}")
+
+    async with httpx.AsyncClient(**_httpx_kwargs(_httpx_transport(httpx.AsyncHTTPTransport))) as client:
+        async def _get(url: str) -> str:
+            resp = await _httpx_get_async(client, url, httpx.Timeout(10.0, read=network_timeout_read))
+            resp.raise_for_status()
+            return resp.text
+
+        return await asyncio.gather(*(_get(u) for u in urls))
+
 def txt(el) -> str:
-    return re.sub(r"\s+", " ", el.get_text(strip=True)) if el else ""
+    # str.split() collapses whitespace runs in C, no regex needed
+    return " ".join(el.get_text(strip=True).split()) if el else ""
 
-def sel_one(root, selector: str):
+def compile_selectors(selectors: Dict[str, str]) -> Dict[str, "soupsieve.SoupSieve"]:
+    """
+    Compile CSS selectors once per page instead of on every select call.
+    Empty or invalid selectors are left out and behave as "no match".
+    """
+    compiled = {}
+    for key, css in selectors.items():
+        if not css:
+            continue
+        try:
+            compiled[key] = soupsieve.compile(css)
+        except Exception:
+            pass
+    return compiled
+
+def sel_one(root, selector):
     try:
-        return root.select_one(selector) if selector else None
+        return selector.select_one(root) if selector is not None else None
     except Exception:
         return None
 
-def sel_all(root, selector: str):
+def sel_all(root, selector, limit: int = 0):
     try:
-        return root.select(selector) if selector else []
+        return selector.select(root, limit=limit) if selector is not None else []
     except Exception:
         return []
 
 def to_abs(url: str, base: str) -> str:
     if not url:
         return url
+    if url.startswith(("http://", "https://")):
+        return url  # already absolute, skip urljoin's parsing
     return urljoin(base, url)
 
 def clean_price(s: str) -> Optional[float]:
     if not s:
         return None
-    m = re.search(r"(\d[\d,]*\.?\d*)", s.replace("\xa0", " "))
+    m = _PRICE_RE.search(s.replace("\xa0", " "))
     if not m:
         return None
     try:
@@ -130,9 +304,9 @@ def parse_products(
     html: str,
     selectors: Dict[str, str],
     max_items: int = 50,
-) -> List[Dict[str, Optional[str]]]:
+) -> Iterator[Dict[str, Optional[str]]]:
     """
-    Generic parser using user-provided CSS selectors.
+    Generic parser using user-provided CSS selectors; yields one dict per card.
     selectors = {
         "card": "CSS for a product card (required)",
         "name": "CSS within card for product name/text",
@@ -142,16 +316,17 @@ def parse_products(
         "link": "CSS within card for product link (href)",
     }
     """
-    soup = BeautifulSoup(html, "html.parser")
-    cards = sel_all(soup, selectors.get("card", ""))[:max_items]
+    soup = BeautifulSoup(html, "lxml")
+    cs = compile_selectors(selectors)
+    # soupsieve treats limit=0 as "no limit"
+    cards = sel_all(soup, cs.get("card"), limit=max_items) if max_items > 0 else []
 
-    out: List[Dict[str, Optional[str]]] = []
     for c in cards:
-        name_el = sel_one(c, selectors.get("name", ""))
-        price_el = sel_one(c, selectors.get("price", ""))
-        image_el = sel_one(c, selectors.get("image", ""))
-        review_el = sel_one(c, selectors.get("review", ""))
-        link_el = sel_one(c, selectors.get("link", ""))
+        name_el = sel_one(c, cs.get("name"))
+        price_el = sel_one(c, cs.get("price"))
+        image_el = sel_one(c, cs.get("image"))
+        review_el = sel_one(c, cs.get("review"))
+        link_el = sel_one(c, cs.get("link"))
 
         name = txt(name_el)
         price_raw = txt(price_el)
@@ -164,35 +339,45 @@ def parse_products(
         review = txt(review_el) if review_el else None
         product_url = to_abs(link_el.get("href"), page_url) if link_el and link_el.has_attr("href") else None
 
-        out.append(
-            {
-                "product_name": name or None,
-                "price_text": price_raw or None,
-                "price_value": price_val,
-                "image_url": image_url,
-                "review": review,
-                "product_url": product_url,
-            }
-        )
-    return out
+        yield {
+            "product_name": name or None,
+            "price_text": price_raw or None,
+            "price_value": price_val,
+            "image_url": image_url,
+            "review": review,
+            "product_url": product_url,
+        }
 
-def scrape_once(
+def temp_csv_path() -> str:
+    tmpdir = tempfile.mkdtemp(prefix="scrape_")
+    return os.path.join(tmpdir, "products.csv")
+
+def scrape_to_csv(
     url: str,
     use_js: bool,
     selectors: Dict[str, str],
     max_items: int = 50,
-) -> pd.DataFrame:
-    html = fetch_html(url, use_js=use_js, network_timeout_read=60)
-    rows = parse_products(url, html, selectors, max_items=max_items)
-    df = pd.DataFrame(rows)
-    # light cleanup for display
-    return df
-
-def make_csv(df: pd.DataFrame) -> str:
-    tmpdir = tempfile.mkdtemp(prefix="scrape_")
-    path = os.path.join(tmpdir, "products.csv")
-    df.to_csv(path, index=False, quoting=csv.QUOTE_MINIMAL)
-    return path
+    out_path: Optional[str] = None,
+    preview_rows: int = 50,
+    use_cache: bool = True,
+) -> Tuple[str, pd.DataFrame, int]:
+    """
+    Stream parsed rows straight into a CSV instead of building a DataFrame first.
+    Returns (csv_path, preview DataFrame of the first `preview_rows` rows, total rows).
+    """
+    html = fetch_html(url, use_js=use_js, network_timeout_read=60, use_cache=use_cache)
+    out_path = out_path or temp_csv_path()
+    preview: List[Dict[str, Optional[str]]] = []
+    count = 0
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, quoting=csv.QUOTE_MINIMAL)
+        writer.writeheader()
+        for row in parse_products(url, html, selectors, max_items=max_items):
+            writer.writerow(row)
+            if count < preview_rows:
+                preview.append(row)
+            count += 1
+    return out_path, pd.DataFrame(preview, columns=CSV_FIELDS), count
 
 # Default selectors (WORKING EXAMPLE for https://books.toscrape.com)
 DEFAULT_SELECTORS = {
@@ -208,6 +393,7 @@ DEFAULT_SELECTORS = {
 def do_scrape(
     url: str,
     use_js: bool,
+    use_cache: bool,
     max_items: int,
     card_css: str,
     name_css: str,
@@ -228,12 +414,15 @@ def do_scrape(
             "review": review_css.strip(),
             "link": link_css.strip(),
         }
-        df = scrape_once(url.strip(), use_js=use_js, selectors=selectors, max_items=int(max_items or 50))
-        if df.empty:
-            return df, None, "No products found with the given selectors. Try adjusting them."
-        csv_path = make_csv(df)
-        msg = f"Scraped {len(df)} rows. CSV is ready."
-        return df.head(50), csv_path, msg
+        csv_path, preview, count = scrape_to_csv(
+            url.strip(), use_js=use_js, selectors=selectors, max_items=int(max_items or 50),
+            use_cache=use_cache,
+        )
+        if count == 0:
+            shutil.rmtree(os.path.dirname(csv_path), ignore_errors=True)
+            return preview, None, "No products found with the given selectors. Try adjusting them."
+        msg = f"Scraped {count} rows. CSV is ready."
+        return preview, csv_path, msg
     except Exception as e:
         return gr.Update(), None, f"Error: {e}"
 
@@ -254,6 +443,7 @@ with gr.Blocks(css="""
         url_in = gr.Textbox(label="Listing URL", placeholder="https://books.toscrape.com/catalogue/category/books_1/index.html")
     with gr.Row():
         use_js_in = gr.Checkbox(label="Render JavaScript (Playwright)", value=False)
+        use_cache_in = gr.Checkbox(label="Use cache", value=True)
         max_items_in = gr.Number(label="Max products", value=50, precision=0)
 
     with gr.Accordion("Advanced: CSS selectors", open=False):
@@ -272,7 +462,7 @@ with gr.Blocks(css="""
     run_btn.click(
         fn=do_scrape,
         inputs=[
-            url_in, use_js_in, max_items_in,
+            url_in, use_js_in, use_cache_in, max_items_in,
             card_css_in, name_css_in, price_css_in, image_css_in, review_css_in, link_css_in
         ],
         outputs=[out_df, out_file, out_msg]
@@ -282,5 +472,5 @@ if __name__ == "__main__":
     # If your venv was created without pip, fix with:
     #   python -m ensurepip --upgrade
     #   python -m pip install --upgrade pip
-    #   python -m pip install requests beautifulsoup4 pandas gradio
+    #   python -m pip install requests beautifulsoup4 lxml pandas gradio
     demo.launch()
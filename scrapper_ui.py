@@ -4,38 +4,45 @@ import sys
 import os
 import io
 import csv
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 
-# --- project root on sys.path so absolute imports work if backend exists ---
 ROOT = Path(__file__).resolve().parent
-sys.path.insert(0, str(ROOT))
-
-# --- Try real backend; if missing, fall back to mocks ---
-BACKEND_OK = True
-try:
-    from prod_assistant.etl.data_scraper import FlipkartScraper  # change to data_scrapper if that's your filename
-    from prod_assistant.etl.data_ingestion import DataIngestion
-except Exception as _e:
-    BACKEND_OK = False
-
-    class FlipkartScraper:  # Mock
-        def scrape_flipkart_products(self, query, max_products=1, review_count=2):
-            # Minimal demo rows: [rank, product_name, price, rating, review_text]
-            return [
-                [1, f"{query} — Demo Variant A", "₹1,999", 4.2, "Solid budget pick."],
-                [2, f"{query} — Demo Variant B", "₹2,499", 4.0, "Decent for the price."],
-            ][:max_products]
-
-        def save_to_csv(self, rows, out_path):
-            Path(out_path).parent.mkdir(parents=True, exist_ok=True)
-            with open(out_path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["rank", "product_name", "price", "rating", "review"])
-                writer.writerows(rows)
-
-    class DataIngestion:  # Mock that raises to block ingestion
-        def run_pipeline(self):
-            raise RuntimeError("Backend ingestion not implemented yet (mock mode).")
+# project root on sys.path so absolute imports work (guarded: reruns don't re-insert)
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from product_assistant.utils.browser_pool import BROWSER_POOL_SIZE
+from product_assistant.utils.batch_writer import BatchWriter
+
+
+class _MockScraper:
+    CSV_HEADER = ["rank", "product_name", "price", "rating", "review"]
+
+    def scrape_flipkart_products(self, query, max_products=1, review_counts=2):
+        # Minimal demo rows: [rank, product_name, price, rating, review_text]
+        return [
+            [1, f"{query} — Demo Variant A", "₹1,999", 4.2, "Solid budget pick."],
+            [2, f"{query} — Demo Variant B", "₹2,499", 4.0, "Decent for the price."],
+        ][:max_products]
+
+    def save_to_csv(self, rows, out_path):
+        with BatchWriter(out_path, header=self.CSV_HEADER) as w:
+            w.add_many(rows)
+
+
+# --- Try real scraper once per process; if missing, fall back to the mock ---
+# DataIngestion (AstraDB/LangChain stack) is imported only when ingestion is requested,
+# so it neither slows UI start-up nor knocks the scraper into mock mode.
+@st.cache_resource
+def _load_backend():
+    try:
+        from product_assistant.etl.data_scrapper import FlipkartScapper as FlipkartScraper
+        return FlipkartScraper, True
+    except Exception:
+        return _MockScraper, False
+
+FlipkartScraper, BACKEND_OK = _load_backend()
 
 
 # --- UI ---
@@ -73,7 +80,26 @@ st.button("➕ Add Another Product", on_click=add_product_input, key="add_btn")
 max_products = st.number_input("How many products per search?", min_value=1, max_value=10, value=1)
 review_count = st.number_input("How many reviews per product?", min_value=1, max_value=10, value=2)
 
-scraper = FlipkartScraper()
+# one query per pooled browser, so K queries take ~ceil(K / workers) scrape times
+MAX_SCRAPE_WORKERS = BROWSER_POOL_SIZE
+
+@st.cache_resource
+def _get_scraper():
+    return FlipkartScraper()
+
+@st.cache_resource
+def _get_executor():
+    return ThreadPoolExecutor(max_workers=MAX_SCRAPE_WORKERS, thread_name_prefix="scrape")
+
+# built once per process, not on every rerun/click; each worker's page jobs
+# run on whichever pooled browser thread is free
+scraper = _get_scraper()
+executor = _get_executor()
+
+def scrape_query(query):
+    return scraper.scrape_flipkart_products(
+        query, max_products=max_products, review_counts=review_count
+    )
 
 if st.button("🚀 Start Scraping", key="scrape_btn"):
     product_inputs = [p.strip() for p in st.session_state.product_inputs if p.strip()]
@@ -83,25 +109,25 @@ if st.button("🚀 Start Scraping", key="scrape_btn"):
     if not product_inputs:
         st.warning("⚠️ Please enter at least one product name or a product description.")
     else:
-        final_data = []
         for query in product_inputs:
             st.write(f"🔍 Searching for: {query}")
-            results = scraper.scrape_flipkart_products(
-                query, max_products=max_products, review_count=review_count
-            )
-            final_data.extend(results or [])
 
-        # de-dup on product_name at index 1
-        unique = {}
-        for row in final_data:
-            if isinstance(row, (list, tuple)) and len(row) > 1:
-                key = row[1]
-                if key not in unique:
-                    unique[key] = row
-        final_data = list(unique.values())
+        final_data = []
+        seen = set()
+        with BatchWriter(OUTPUT, header=FlipkartScraper.CSV_HEADER) as writer:
+            futures = [executor.submit(scrape_query, q) for q in product_inputs]
+            # consume in input order so de-dup stays first-seen by query
+            for f in futures:
+                # de-dup on product_name at index 1 (seen.add returns None, so first sighting passes)
+                new_rows = [
+                    r for r in f.result() or []
+                    if isinstance(r, (list, tuple)) and len(r) > 1
+                    and not (r[1] in seen or seen.add(r[1]))
+                ]
+                writer.add_many(new_rows)
+                final_data.extend(new_rows)
 
         st.session_state["scraped_data"] = final_data
-        scraper.save_to_csv(final_data, str(OUTPUT))
         st.success(f"✅ Data saved to `{OUTPUT.as_posix()}`")
 
         # Safer download: open and read bytes
@@ -113,20 +139,23 @@ if st.button("🚀 Start Scraping", key="scrape_btn"):
                 mime="text/csv"
             )
 
-# Ingestion: enabled only if real backend present
+# Ingestion: enabled only for real (non-demo) scraped data
 ingest_disabled = not BACKEND_OK
 if "scraped_data" in st.session_state:
     if ingest_disabled:
         st.button("🧠 Store in Vector DB (AstraDB)", disabled=True, help="Enable after backend is ready.")
-        st.info("Backend not wired yet. Once `prod_assistant.etl.data_ingestion.DataIngestion` is implemented, this will activate.")
+        st.info("Scraper backend not loaded; demo data is not ingested.")
     else:
         if st.button("🧠 Store in Vector DB (AstraDB)", key="ingest_btn"):
             with st.spinner("📡 Initializing ingestion pipeline..."):
                 try:
+                    from product_assistant.etl.data_ingestion import DataIngestion
                     ingestion = DataIngestion()
                     st.info("🚀 Running ingestion pipeline...")
                     ingestion.run_pipeline()
                     st.success("✅ Data successfully ingested to AstraDB!")
+                except NotImplementedError:
+                    st.warning("⚠️ The ingestion pipeline is not implemented yet; nothing was stored.")
                 except Exception as e:
                     st.error("❌ Ingestion failed!")
                     st.exception(e)